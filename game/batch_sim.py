@@ -0,0 +1,194 @@
+import sys
+import time
+import numpy as np
+
+# Mirrors the board constants in snake.py without importing it, since that
+# module opens a window at import time.
+DEFAULT_WIDTH = 800
+DEFAULT_HEIGHT = 600
+CELL_SIZE = 25
+
+# Same order as get_next_move: Right, Left, Down, Up (in cells, as (dx, dy))
+MOVES = np.array([
+    (1, 0),
+    (-1, 0),
+    (0, 1),
+    (0, -1)
+], dtype=np.int32)
+
+
+class BatchSnakeSim:
+    """Steps many independent AI-controlled snake games at once with NumPy.
+
+    Every game follows the same greedy rule as get_next_move/is_safe_move
+    in snake.py, but positions are kept in cell units instead of pixels.
+    Bodies are stored as per-game ring buffers of flat cell indices, and
+    occupancy as a (K, rows, cols) uint8 tensor.
+    """
+
+    def __init__(self, num_games, width=DEFAULT_WIDTH, height=DEFAULT_HEIGHT,
+                 cell_size=CELL_SIZE, seed=None):
+        self.num_games = num_games
+        self.cell_size = cell_size
+        self.cols = width // cell_size
+        self.rows = height // cell_size
+        self.num_cells = self.cols * self.rows
+        # MOVES as offsets between flat cell indices
+        self.cell_offsets = MOVES[:, 1] * self.cols + MOVES[:, 0]
+        self.rng = np.random.default_rng(seed)
+
+        index_dtype = np.int16 if self.num_cells < 2 ** 15 else np.int32
+        self.occupancy = np.zeros((num_games, self.rows, self.cols), dtype=np.uint8)
+        # Same memory viewed as (K, rows * cols), indexed by flat cell
+        self.flat_occupancy = self.occupancy.reshape(num_games, -1)
+        self.body = np.zeros((num_games, self.num_cells), dtype=index_dtype)
+        self.head_ptr = np.zeros(num_games, dtype=np.int32)
+        self.tail_ptr = np.zeros(num_games, dtype=np.int32)
+        self.length = np.zeros(num_games, dtype=np.int32)
+        self.head = np.zeros((num_games, 2), dtype=np.int32)
+        self.direction = np.zeros(num_games, dtype=np.int8)
+        self.food = np.zeros((num_games, 2), dtype=np.int32)
+        self.score = np.zeros(num_games, dtype=np.int32)
+        self.steps = np.zeros(num_games, dtype=np.int32)
+        self.done = np.zeros(num_games, dtype=bool)
+
+        self.reset()
+
+    def reset(self):
+        """Put every game back at its starting state"""
+        self.occupancy.fill(0)
+        self.body.fill(0)
+        self.head_ptr.fill(0)
+        self.tail_ptr.fill(0)
+        self.length.fill(1)
+        self.direction.fill(0)
+        self.score.fill(0)
+        self.steps.fill(0)
+        self.done.fill(False)
+
+        # Same start as main(): the middle of the board
+        self.head[:, 0] = self.cols // 2
+        self.head[:, 1] = self.rows // 2
+        self.body[:, 0] = self.head[:, 1] * self.cols + self.head[:, 0]
+        self.occupancy[:, self.rows // 2, self.cols // 2] = 1
+
+        self._place_food(np.arange(self.num_games))
+
+    def _place_food(self, games):
+        """Pick a free random cell for each game in `games`"""
+        pending = games
+        while len(pending):
+            x = self.rng.integers(0, self.cols, size=len(pending))
+            y = self.rng.integers(0, self.rows, size=len(pending))
+            free = self.flat_occupancy[pending, y * self.cols + x] == 0
+            placed = pending[free]
+            self.food[placed, 0] = x[free]
+            self.food[placed, 1] = y[free]
+            pending = pending[~free]
+
+    def next_moves(self, games=None):
+        """Vectorized get_next_move: index into MOVES per game, -1 if trapped"""
+        if games is None:
+            games = np.arange(self.num_games)
+        hx = self.head[games, 0]
+        hy = self.head[games, 1]
+
+        # (n, 4) masks and flat cells for each candidate head, in MOVES order
+        in_bounds = np.column_stack((hx < self.cols - 1, hx > 0, hy < self.rows - 1, hy > 0))
+        cells = (games * self.num_cells + hy * self.cols + hx)[:, None] + self.cell_offsets
+        # Off-board candidates read some other cell, but in_bounds masks them out
+        occupied = self.occupancy.ravel().take(cells, mode='clip')
+        safe = in_bounds & (occupied == 0)
+
+        dx = hx - self.food[games, 0]
+        dy = hy - self.food[games, 1]
+        adx = np.abs(dx)
+        ady = np.abs(dy)
+        distance = np.column_stack((np.abs(dx + 1) + ady, np.abs(dx - 1) + ady,
+                                    adx + np.abs(dy + 1), adx + np.abs(dy - 1)))
+        distance[~safe] = np.iinfo(distance.dtype).max
+
+        # argmin returns the first minimum, matching the strict `<` in get_next_move
+        moves = np.argmin(distance, axis=1).astype(np.int8)
+        moves[~safe.any(axis=1)] = -1
+        return moves
+
+    def step(self):
+        """Advance every running game by one tick and return the done mask"""
+        # Finished games are left alone entirely
+        active = np.flatnonzero(~self.done)
+        if not len(active):
+            return self.done
+
+        moves = self.next_moves(active)
+        self.done[active[moves < 0]] = True
+        active = active[moves >= 0]
+        moves = moves[moves >= 0]
+        if not len(active):
+            return self.done
+
+        self.direction[active] = moves
+        new_head = self.head[active] + MOVES[moves]
+        self.head[active] = new_head
+        self.steps[active] += 1
+
+        # Push the new head onto each ring buffer
+        new_cells = new_head[:, 1] * self.cols + new_head[:, 0]
+        self.head_ptr[active] = (self.head_ptr[active] + 1) % self.num_cells
+        self.body[active, self.head_ptr[active]] = new_cells
+        self.flat_occupancy[active, new_cells] = 1
+
+        ate = np.all(new_head == self.food[active], axis=1)
+        grew = active[ate]
+        moved = active[~ate]
+
+        # Games that didn't eat drop their tail
+        tail = self.body[moved, self.tail_ptr[moved]]
+        self.flat_occupancy[moved, tail] = 0
+        self.tail_ptr[moved] = (self.tail_ptr[moved] + 1) % self.num_cells
+
+        self.score[grew] += 1
+        self.length[grew] += 1
+
+        # A full board has nowhere left to put food
+        full = grew[self.length[grew] >= self.num_cells]
+        self.done[full] = True
+        self._place_food(grew[self.length[grew] < self.num_cells])
+
+        return self.done
+
+    def run(self, max_steps=10000):
+        """Step until every game is over or `max_steps` ticks have passed"""
+        for _ in range(max_steps):
+            if self.step().all():
+                break
+        return self.score.copy()
+
+    def snake(self, game):
+        """Body of one game as a head-first list of pixel positions, like main()'s `snake`"""
+        length = self.length[game]
+        idx = (self.head_ptr[game] - np.arange(length)) % self.num_cells
+        cells = self.body[game, idx].astype(np.int32)
+        return [(int(c % self.cols) * self.cell_size, int(c // self.cols) * self.cell_size) for c in cells]
+
+    def food_position(self, game):
+        """Food of one game in pixel coordinates"""
+        return (int(self.food[game, 0]) * self.cell_size, int(self.food[game, 1]) * self.cell_size)
+
+
+def main():
+    num_games = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    max_steps = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+
+    sim = BatchSnakeSim(num_games)
+    start = time.time()
+    scores = sim.run(max_steps)
+    elapsed = time.time() - start
+
+    total_steps = int(sim.steps.sum())
+    print(f"Games: {num_games}  Ticks: {total_steps}  Time: {elapsed:.2f}s "
+          f"({total_steps / max(elapsed, 1e-9):,.0f} ticks/s)")
+    print(f"Score mean: {scores.mean():.2f}  max: {scores.max()}  finished: {int(sim.done.sum())}")
+
+if __name__ == "__main__":
+    main()
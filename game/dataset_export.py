@@ -0,0 +1,307 @@
+import json
+import os
+import sys
+import time
+import numpy as np
+
+# Board cell values used in recorded states
+EMPTY = 0
+BODY = 1
+HEAD = 2
+FOOD = 3
+
+# Outcome of a single action
+OUTCOME_MOVED = 0
+OUTCOME_ATE = 1
+OUTCOME_DIED = -1
+
+INDEX_FILE = "index.json"
+
+
+def sample_dtype(rows, cols):
+    """Fixed-size record for one (state, action, outcome) sample"""
+    return np.dtype([
+        ('state', np.uint8, (rows, cols)),
+        ('action', np.int8),
+        ('outcome', np.int8),
+        ('game', np.int32),
+        ('step', np.int32)
+    ])
+
+
+def encode_state(snake, food_pos, rows, cols, cell_size):
+    """Turn main()'s pixel-space snake and food into a (rows, cols) board"""
+    state = np.zeros((rows, cols), dtype=np.uint8)
+    for x, y in snake[1:]:
+        state[y // cell_size, x // cell_size] = BODY
+    state[food_pos[1] // cell_size, food_pos[0] // cell_size] = FOOD
+    state[snake[0][1] // cell_size, snake[0][0] // cell_size] = HEAD
+    return state
+
+
+def truncate_shard(path, dtype, offset, count):
+    """Shrink a preallocated .npy shard to its first `count` records
+
+    The header is rewritten before the file is cut, so if truncating fails the
+    header still describes a prefix of the data and the file stays loadable.
+    """
+    with open(path, 'r+b') as f:
+        major, minor = np.lib.format.read_magic(f)
+        # Keep the header the same size so the data doesn't have to move
+        length_size = 2 if major == 1 else 4
+        header_size = offset - f.tell() - length_size
+        header = repr({
+            'descr': np.lib.format.dtype_to_descr(dtype),
+            'fortran_order': False,
+            'shape': (count,)
+        })
+        header = header.ljust(header_size - 1) + "\n"
+        f.seek(0)
+        f.write(np.lib.format.magic(major, minor))
+        f.write(header_size.to_bytes(length_size, 'little'))
+        f.write(header.encode('utf8' if major >= 3 else 'latin1'))
+        f.truncate(offset + count * dtype.itemsize)
+
+
+class DatasetWriter:
+    """Streams samples into fixed-shape .npy shards through numpy.memmap.
+
+    Each shard is preallocated to hold `shard_size_mb` worth of samples and a
+    new one is started when it fills up. index.json lists the shards and how
+    many samples of each are valid; it is only rewritten after the shard data
+    has been flushed, so readers can open it while recording is in progress.
+    close() tries to trim the last shard to its samples so it can be read with
+    np.load alone. That is best-effort: if a reader still has the shard mapped
+    (truncating it then fails on Windows) the shard keeps its preallocated
+    size, and only index.json says how many records are valid. Opening a
+    directory that already has an index appends to that dataset.
+    """
+
+    def __init__(self, directory, rows, cols, shard_size_mb=64, flush_every=4096, flush_interval=1.0):
+        self.directory = directory
+        self.rows = rows
+        self.cols = cols
+        self.dtype = sample_dtype(rows, cols)
+        self.shard_capacity = max(1, (shard_size_mb * 1024 * 1024) // self.dtype.itemsize)
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.last_flush = time.monotonic()
+
+        os.makedirs(directory, exist_ok=True)
+        self.shards, self.next_game = self._load_index()
+        self.current = None
+        self.count = 0
+        self.unflushed = 0
+
+    def _load_index(self):
+        """Shards and next free game id from the directory's index, if there is one"""
+        index_file = os.path.join(self.directory, INDEX_FILE)
+        if not os.path.exists(index_file):
+            return [], 0
+        with open(index_file, 'r') as f:
+            index = json.load(f)
+        if (index['rows'], index['cols']) != (self.rows, self.cols):
+            raise ValueError(
+                f"{self.directory} holds {index['cols']}x{index['rows']} boards, "
+                f"not {self.cols}x{self.rows}"
+            )
+        if 'next_game' in index:
+            return index['shards'], index['next_game']
+
+        # Older indexes don't track game ids; carry on after the highest one
+        next_game = 0
+        for shard in index['shards']:
+            if shard['count']:
+                games = np.load(os.path.join(self.directory, shard['file']), mmap_mode='r')['game']
+                next_game = max(next_game, int(games[:shard['count']].max()) + 1)
+        return index['shards'], next_game
+
+    def new_games(self, n=1):
+        """Reserve `n` consecutive game ids and return the first one"""
+        first = self.next_game
+        self.next_game += n
+        return first
+
+    def _open_shard(self):
+        # Never reuse a file name, even one the index doesn't list
+        number = len(self.shards)
+        while os.path.exists(os.path.join(self.directory, f"shard_{number:05d}.npy")):
+            number += 1
+        name = f"shard_{number:05d}.npy"
+        path = os.path.join(self.directory, name)
+        self.current = np.lib.format.open_memmap(
+            path, mode='w+', dtype=self.dtype, shape=(self.shard_capacity,)
+        )
+        self.count = 0
+        self.shards.append({'file': name, 'count': 0})
+
+    def append(self, state, action, outcome, game=0, step=0):
+        """Record a single sample"""
+        if self.current is None or self.count >= self.shard_capacity:
+            self._roll_over()
+        record = self.current[self.count]
+        record['state'] = state
+        record['action'] = action
+        record['outcome'] = outcome
+        record['game'] = game
+        record['step'] = step
+        self.count += 1
+        self._written(1)
+
+    def append_batch(self, states, actions, outcomes, games, steps):
+        """Record many samples at once, splitting across shards as needed"""
+        total = len(actions)
+        start = 0
+        while start < total:
+            if self.current is None or self.count >= self.shard_capacity:
+                self._roll_over()
+            n = min(total - start, self.shard_capacity - self.count)
+            block = self.current[self.count:self.count + n]
+            block['state'] = states[start:start + n]
+            block['action'] = actions[start:start + n]
+            block['outcome'] = outcomes[start:start + n]
+            block['game'] = games[start:start + n]
+            block['step'] = steps[start:start + n]
+            self.count += n
+            start += n
+            self._written(n)
+
+    def _written(self, n):
+        self.unflushed += n
+        # Publish by count for fast batch runs, and by time for the live game
+        if (self.unflushed >= self.flush_every or
+                time.monotonic() - self.last_flush >= self.flush_interval):
+            self.flush()
+
+    def _roll_over(self):
+        if self.current is not None:
+            self.flush()
+            del self.current
+        self._open_shard()
+
+    def flush(self):
+        """Push shard data to disk, then publish the new counts in the index"""
+        if self.current is not None:
+            self.current.flush()
+            self.shards[-1]['count'] = self.count
+        self.unflushed = 0
+        self.last_flush = time.monotonic()
+        self._write_index()
+
+    def _write_index(self):
+        index = {
+            'rows': self.rows,
+            'cols': self.cols,
+            'next_game': self.next_game,
+            'shards': self.shards
+        }
+        index_file = os.path.join(self.directory, INDEX_FILE)
+        tmp_file = index_file + ".tmp"
+        with open(tmp_file, 'w') as f:
+            json.dump(index, f, indent=4)
+        os.replace(tmp_file, index_file)
+
+    def close(self):
+        self.flush()
+        if self.current is not None:
+            offset = self.current.offset
+            del self.current
+            self.current = None
+            path = os.path.join(self.directory, self.shards[-1]['file'])
+            try:
+                truncate_shard(path, self.dtype, offset, self.count)
+            except OSError as e:
+                print(f"Could not trim {path}, index.json still has its count: {e}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class DatasetReader:
+    """Read-only, zero-copy view over the shards listed in index.json"""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._shards = {}
+        self.refresh()
+
+    def refresh(self):
+        """Re-read the index to pick up samples written since the last call"""
+        with open(os.path.join(self.directory, INDEX_FILE), 'r') as f:
+            index = json.load(f)
+        self.rows = index['rows']
+        self.cols = index['cols']
+        self.counts = [(shard['file'], shard['count']) for shard in index['shards']]
+
+    def _shard(self, name):
+        if name not in self._shards:
+            self._shards[name] = np.load(os.path.join(self.directory, name), mmap_mode='r')
+        return self._shards[name]
+
+    def __len__(self):
+        return sum(count for _, count in self.counts)
+
+    def shards(self):
+        """Yield the valid part of each shard as a memory-mapped record array"""
+        for name, count in self.counts:
+            if count:
+                yield self._shard(name)[:count]
+
+    def iter_batches(self, batch_size=4096):
+        """Yield record arrays of up to `batch_size` samples without copying"""
+        for shard in self.shards():
+            for start in range(0, len(shard), batch_size):
+                yield shard[start:start + batch_size]
+
+    def __iter__(self):
+        for batch in self.iter_batches():
+            yield from batch
+
+
+def record_batch_sim(sim, writer, max_steps=10000):
+    """Run a BatchSnakeSim headless and record every game's moves"""
+    games = np.arange(sim.num_games, dtype=np.int32) + writer.new_games(sim.num_games)
+    rows = np.arange(sim.num_games)
+    for _ in range(max_steps):
+        running = ~sim.done
+        if not running.any():
+            break
+
+        states = sim.occupancy.copy()
+        states[rows, sim.food[:, 1], sim.food[:, 0]] = FOOD
+        states[rows, sim.head[:, 1], sim.head[:, 0]] = HEAD
+        steps = sim.steps.copy()
+        score = sim.score.copy()
+
+        sim.step()
+
+        moved = running & (sim.steps > steps)
+        actions = np.where(moved, sim.direction, -1).astype(np.int8)
+        outcomes = np.full(sim.num_games, OUTCOME_MOVED, dtype=np.int8)
+        outcomes[sim.score > score] = OUTCOME_ATE
+        outcomes[running & ~moved] = OUTCOME_DIED
+
+        writer.append_batch(states[running], actions[running], outcomes[running],
+                            games[running], steps[running])
+    writer.flush()
+
+
+def main():
+    from batch_sim import BatchSnakeSim
+
+    directory = sys.argv[1] if len(sys.argv) > 1 else os.path.join("data", "dataset")
+    num_games = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    max_steps = int(sys.argv[3]) if len(sys.argv) > 3 else 2000
+
+    sim = BatchSnakeSim(num_games)
+    with DatasetWriter(directory, sim.rows, sim.cols) as writer:
+        record_batch_sim(sim, writer, max_steps)
+
+    reader = DatasetReader(directory)
+    print(f"Recorded {len(reader)} samples in {len(reader.counts)} shard(s) to {directory}")
+
+if __name__ == "__main__":
+    main()
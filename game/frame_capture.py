@@ -0,0 +1,204 @@
+import os
+import queue
+import sys
+import threading
+import time
+import zlib
+from collections import deque
+
+# Render without a window when run headless; must be set before pygame starts
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+
+class FrameCapture:
+    """Encodes game frames to a PNG sequence or animated GIF in the background.
+
+    capture() copies the surface's pixels and hands them to an encoder thread
+    through a bounded queue, so the game never waits on disk or compression.
+    Frames are skipped when the board hasn't changed since the last one. If
+    the encoder falls too far behind, frames are dropped (and counted) unless
+    `drop_frames` is False, in which case capture() waits. An output path
+    ending in .gif writes a GIF (needs Pillow); anything else is a directory
+    of numbered PNGs. A GIF keeps only the last `max_gif_frames` frames,
+    held compressed until close() writes them out, and each frame is shown
+    for as long as the ticks dropped after it would have been.
+    """
+
+    def __init__(self, output, scale=1.0, max_queue=64, frame_duration=100, drop_frames=True,
+                 max_gif_frames=500):
+        self.output = output
+        self.drop_frames = drop_frames
+        self.scale = scale
+        self.frame_duration = frame_duration
+        self.is_gif = output.lower().endswith(".gif")
+        if self.is_gif:
+            try:
+                from PIL import Image
+            except ImportError:
+                raise ImportError("GIF export needs Pillow: pip install pillow")
+            self.gif_frames = deque(maxlen=max_gif_frames)
+        else:
+            os.makedirs(output, exist_ok=True)
+            # Pillow's PNG encoder lets go of the GIL, pygame's doesn't, so
+            # prefer it to keep the encoder from stalling the game thread
+            try:
+                from PIL import Image
+                self.png_writer = Image
+            except ImportError:
+                self.png_writer = None
+
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.last_board = None
+        self.captured = 0
+        self.dropped = 0
+        self.dropped_since_last = 0
+        self.encoded = 0
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def capture(self, surface, board):
+        """Queue `surface` if `board` (any comparable state) differs from the last frame"""
+        if board == self.last_board:
+            return False
+        self.last_board = board
+
+        frame = (pygame.image.tobytes(surface, "RGB"), surface.get_size(), self.dropped_since_last)
+        try:
+            self.queue.put(frame, block=not self.drop_frames)
+        except queue.Full:
+            self.dropped += 1
+            self.dropped_since_last += 1
+            return False
+        self.dropped_since_last = 0
+        self.captured += 1
+        return True
+
+    def _run(self):
+        while True:
+            frame = self.queue.get()
+            if frame is None:
+                if self.is_gif:
+                    if self.gif_frames:
+                        self.gif_frames[-1][2] += self.dropped_since_last
+                    self._write_gif()
+                break
+            try:
+                self._encode(*frame)
+            except Exception as e:
+                print(f"Error encoding frame: {e}")
+
+    def _encode(self, data, size, dropped_before):
+        surface = pygame.image.frombytes(data, size, "RGB")
+        if self.scale != 1.0:
+            scaled_size = (max(1, int(size[0] * self.scale)), max(1, int(size[1] * self.scale)))
+            surface = pygame.transform.smoothscale(surface, scaled_size)
+
+        if self.is_gif:
+            # Quantizing is left for _write_gif(); a fast zlib pass keeps the ring small
+            data = zlib.compress(pygame.image.tobytes(surface, "RGB"), 1)
+            if self.gif_frames:
+                # The previous frame stays up through the ticks dropped since it
+                self.gif_frames[-1][2] += dropped_before
+            self.gif_frames.append([data, surface.get_size(), 1])
+        else:
+            path = os.path.join(self.output, f"frame_{self.encoded:06d}.png")
+            if self.png_writer:
+                image = self.png_writer.frombytes("RGB", surface.get_size(), pygame.image.tobytes(surface, "RGB"))
+                image.save(path, compress_level=1)
+            else:
+                pygame.image.save(surface, path)
+        self.encoded += 1
+
+    def _write_gif(self):
+        if not self.gif_frames:
+            return
+        from PIL import Image
+        try:
+            images = [
+                Image.frombytes("RGB", size, zlib.decompress(data)).convert("P", palette=Image.ADAPTIVE)
+                for data, size, _ in self.gif_frames
+            ]
+            images[0].save(
+                self.output,
+                save_all=True,
+                append_images=images[1:],
+                duration=[ticks * self.frame_duration for _, _, ticks in self.gif_frames],
+                loop=0
+            )
+        except Exception as e:
+            print(f"Error saving GIF: {e}")
+
+    def close(self):
+        """Wait for queued frames to be encoded and finish the output file"""
+        self.queue.put(None)
+        self.thread.join()
+        saved = len(self.gif_frames) if self.is_gif else self.encoded
+        print(f"Captured {saved} frames to {self.output} ({self.dropped} dropped)")
+
+
+def capture_headless(output, ticks=1000, start=0, scale=1.0, drop_frames=False):
+    """Run the AI without a display, skip `start` ticks, then capture the next `ticks`
+
+    By default the simulation waits for the encoder so the clip has no gaps;
+    that is still well ahead of real time. With `drop_frames` it never waits.
+    """
+    import snake as game
+
+    game.WIDTH, game.HEIGHT = game.load_settings()
+    game.screen = pygame.Surface((game.WIDTH, game.HEIGHT))
+
+    body = [(game.WIDTH//2, game.HEIGHT//2)]
+    food_pos = game.get_food_position(body)
+    score = 0
+    move_delay = 0.1
+    elapsed_time = 0
+    tick = 0
+
+    capture = FrameCapture(output, scale=scale, frame_duration=int(move_delay * 1000),
+                           drop_frames=drop_frames, max_gif_frames=ticks)
+    began = time.time()
+    try:
+        while tick < start + ticks:
+            direction = game.get_next_move(body, food_pos)
+            if direction is None:
+                break
+
+            head = (body[0][0] + direction[0], body[0][1] + direction[1])
+            body.insert(0, head)
+            if head == food_pos:
+                score += 1
+                food_pos = game.get_food_position(body)
+                move_delay = max(0.05, move_delay - 0.001)
+            else:
+                body.pop()
+
+            # Game time, as the timer would show it at normal speed
+            elapsed_time += move_delay
+            tick += 1
+
+            if tick > start:
+                game.screen.fill(game.DARK_BLUE)
+                game.draw_grid()
+                game.draw_snake(body)
+                game.draw_food(food_pos)
+                game.draw_score_and_time(score, elapsed_time)
+                capture.capture(game.screen, (head, body[-1], len(body), food_pos, score))
+        sim_time = time.time() - began
+    finally:
+        capture.close()
+
+    print(f"Simulated {tick} ticks ({elapsed_time:.1f}s of game time) in {sim_time:.1f}s, "
+          f"output finished after {time.time() - began:.1f}s")
+
+if __name__ == "__main__":
+    # python game/frame_capture.py <output dir | clip.gif> [ticks] [start] [scale] [--drop]
+    # --drop never lets the simulation wait for the encoder, skipping frames instead
+    args = [arg for arg in sys.argv[1:] if arg != "--drop"]
+    output = args[0] if len(args) > 0 else os.path.join("data", "frames")
+    ticks = int(args[1]) if len(args) > 1 else 1000
+    start = int(args[2]) if len(args) > 2 else 0
+    scale = float(args[3]) if len(args) > 3 else 1.0
+    capture_headless(output, ticks, start, scale, drop_frames="--drop" in sys.argv)
@@ -574,7 +574,12 @@ def update_screen_size(new_width, new_height):
         Button(button_x, HEIGHT//2 + 150, button_width, button_height, "Exit", lambda: [save_score(score, time.time() - start_time), sys.exit()])
     ]
 
-def main():
+def get_grid_size():
+    # Round up: on sizes like 1024x768 the snake starts off the 25px grid
+    # and can reach a partial cell at the right or bottom edge
+    return -(-WIDTH // CELL_SIZE), -(-HEIGHT // CELL_SIZE)
+
+def main(record_dir=None, stream_address=None, capture_output=None, capture_scale=1.0):
     global score, start_time, WIDTH, HEIGHT  # Make these accessible to other functions
     
     # Load saved settings
@@ -596,6 +601,30 @@ def main():
     last_move_time = time.time()
     move_delay = 0.1
     start_time = time.time()
+    step = 0
+
+    # Optionally record (state, action, outcome) samples for training
+    recorder = None
+    if record_dir:
+        # Imported here so numpy is only needed when recording
+        from dataset_export import DatasetWriter, encode_state, OUTCOME_ATE, OUTCOME_MOVED, OUTCOME_DIED
+        cols, rows = get_grid_size()
+        recorder = DatasetWriter(record_dir, rows, cols)
+        game_id = recorder.new_games()
+
+    # Optionally stream each tick's changes to local spectators
+    stream = None
+    if stream_address:
+        from state_stream import StateStreamServer
+        stream = StateStreamServer(stream_address, *get_grid_size())
+        stream.reset([(x // CELL_SIZE, y // CELL_SIZE) for x, y in snake],
+                     (food_pos[0] // CELL_SIZE, food_pos[1] // CELL_SIZE), score)
+
+    # Optionally save frames as PNGs or a GIF while playing
+    capture = None
+    if capture_output:
+        from frame_capture import FrameCapture
+        capture = FrameCapture(capture_output, scale=capture_scale)
 
     # Create pause menu buttons
     button_width = 200
@@ -632,19 +661,36 @@ def main():
                 # AI movement
                 if current_time - last_move_time >= move_delay:
                     direction = get_next_move(snake, food_pos)
+                    if recorder:
+                        state = encode_state(snake, food_pos, recorder.rows, recorder.cols, CELL_SIZE)
                     if direction is None:
+                        if recorder:
+                            recorder.append(state, -1, OUTCOME_DIED, game=game_id, step=step)
+                            recorder.close()
+                        if stream:
+                            stream.game_over()
                         game_over()
                     
                     head = (snake[0][0] + direction[0], snake[0][1] + direction[1])
                     snake.insert(0, head)
 
-                    if head == food_pos:
+                    ate = head == food_pos
+                    if ate:
                         score += 1
                         food_pos = get_food_position(snake)
                         move_delay = max(0.05, move_delay - 0.001)
                     else:
                         snake.pop()
 
+                    if recorder:
+                        outcome = OUTCOME_ATE if ate else OUTCOME_MOVED
+                        action = [(CELL_SIZE, 0), (-CELL_SIZE, 0), (0, CELL_SIZE), (0, -CELL_SIZE)].index(direction)
+                        recorder.append(state, action, outcome, game=game_id, step=step)
+                    if stream:
+                        stream.publish((head[0] // CELL_SIZE, head[1] // CELL_SIZE), not ate,
+                                       (food_pos[0] // CELL_SIZE, food_pos[1] // CELL_SIZE), score)
+                    step += 1
+
                     last_move_time = current_time
 
             # Draw everything
@@ -656,6 +702,8 @@ def main():
             
             if paused:
                 draw_pause_menu(pause_buttons)
+            elif capture:
+                capture.capture(screen, (snake[0], snake[-1], len(snake), food_pos, score))
             
             pygame.display.flip()
             clock.tick(60)
@@ -663,7 +711,28 @@ def main():
     finally:
         # Save score when exiting
         save_score(score, time.time() - start_time)
+        if recorder:
+            recorder.close()
+        if stream:
+            stream.close()
+        if capture:
+            capture.close()
         pygame.quit()
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    # python game/snake.py --record <dir> saves the AI's moves as a dataset
+    # python game/snake.py --stream <host:port|unix:path> lets spectators watch
+    # python game/snake.py --capture <dir|clip.gif> [--capture-scale 0.5] saves the frames
+    record_dir = None
+    stream_address = None
+    capture_output = None
+    capture_scale = 1.0
+    if "--record" in sys.argv:
+        record_dir = sys.argv[sys.argv.index("--record") + 1]
+    if "--stream" in sys.argv:
+        stream_address = sys.argv[sys.argv.index("--stream") + 1]
+    if "--capture" in sys.argv:
+        capture_output = sys.argv[sys.argv.index("--capture") + 1]
+    if "--capture-scale" in sys.argv:
+        capture_scale = float(sys.argv[sys.argv.index("--capture-scale") + 1])
+    main(record_dir, stream_address, capture_output, capture_scale)
\ No newline at end of file
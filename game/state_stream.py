@@ -0,0 +1,364 @@
+import os
+import selectors
+import socket
+import stat
+import struct
+import sys
+import threading
+import time
+from collections import deque
+
+# Message layouts (little-endian, positions in cells)
+MSG_KEYFRAME = 0
+MSG_DELTA = 1
+MSG_GAME_OVER = 2
+
+KEYFRAME = struct.Struct('<BHHHHII')  # type, cols, rows, food x, food y, score, length
+SEGMENT = struct.Struct('<HH')        # x, y (repeated `length` times, head first)
+DELTA = struct.Struct('<BBHH')        # type, flags, head x, head y
+FOOD = struct.Struct('<HH')           # new food x, y (if FOOD_CHANGED)
+SCORE = struct.Struct('<I')           # new score (if SCORE_CHANGED)
+GAME_OVER = struct.Struct('<B')       # type
+
+# Delta flags
+TAIL_REMOVED = 1
+FOOD_CHANGED = 2
+SCORE_CHANGED = 4
+
+DEFAULT_ADDRESS = "127.0.0.1:5555"
+
+
+def parse_address(address):
+    """'unix:/path/to.sock' or 'host:port' -> (family, sockaddr)"""
+    if address.startswith("unix:"):
+        # Windows builds of Python have no AF_UNIX
+        if not hasattr(socket, "AF_UNIX"):
+            raise ValueError(f"Unix sockets aren't supported on this platform, use host:port instead of {address}")
+        return socket.AF_UNIX, address[len("unix:"):]
+    host, port = address.rsplit(":", 1)
+    return socket.AF_INET, (host, int(port))
+
+
+def encode_keyframe(cols, rows, snake, food, score):
+    parts = [KEYFRAME.pack(MSG_KEYFRAME, cols, rows, food[0], food[1], score, len(snake))]
+    parts.extend(SEGMENT.pack(x, y) for x, y in snake)
+    return b"".join(parts)
+
+
+class StateStreamServer:
+    """Publishes per-tick game state changes to local spectators.
+
+    The game loop calls publish() once per tick; that only updates a mirror of
+    the board and appends a few bytes to a pending buffer. A background thread
+    sends the pending deltas to every client in batches, and a new client gets
+    a keyframe of the full board first. Clients whose unsent data grows past
+    `max_buffer` are dropped instead of ever blocking the game.
+    """
+
+    def __init__(self, address, cols, rows, flush_interval=1 / 60, max_buffer=1024 * 1024):
+        self.cols = cols
+        self.rows = rows
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+
+        self.snake = deque()
+        self.food = (0, 0)
+        self.score = 0
+        self.pending = bytearray()
+        self.lock = threading.Lock()
+        self.clients = {}
+
+        family, sockaddr = parse_address(address)
+        is_unix = family != socket.AF_INET
+        if is_unix and os.path.exists(sockaddr):
+            # Only clear away a stale socket, never a regular file
+            if not stat.S_ISSOCK(os.stat(sockaddr).st_mode):
+                raise FileExistsError(f"{sockaddr} exists and is not a socket")
+            os.unlink(sockaddr)
+        self.unix_path = sockaddr if is_unix else None
+        self.listener = socket.socket(family, socket.SOCK_STREAM)
+        if not is_unix:
+            self.listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.listener.bind(sockaddr)
+        self.listener.listen()
+        self.listener.setblocking(False)
+
+        self.selector = selectors.DefaultSelector()
+        self.selector.register(self.listener, selectors.EVENT_READ)
+        self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def reset(self, snake, food, score=0):
+        """Start a new game and send every client a keyframe of it"""
+        with self.lock:
+            self.snake = deque(snake)
+            self.food = (int(food[0]), int(food[1]))
+            self.score = score
+            self.pending += self._keyframe()
+
+    def publish(self, head, tail_removed, food, score):
+        """Record one tick: the new head, whether the tail moved, food and score"""
+        with self.lock:
+            self.snake.appendleft(head)
+            flags = 0
+            if tail_removed:
+                self.snake.pop()
+                flags |= TAIL_REMOVED
+            food = (int(food[0]), int(food[1]))
+            if food != self.food:
+                self.food = food
+                flags |= FOOD_CHANGED
+            if score != self.score:
+                self.score = score
+                flags |= SCORE_CHANGED
+
+            self.pending += DELTA.pack(MSG_DELTA, flags, head[0], head[1])
+            if flags & FOOD_CHANGED:
+                self.pending += FOOD.pack(*food)
+            if flags & SCORE_CHANGED:
+                self.pending += SCORE.pack(score)
+
+    def game_over(self):
+        with self.lock:
+            self.pending += GAME_OVER.pack(MSG_GAME_OVER)
+
+    def _keyframe(self):
+        return encode_keyframe(self.cols, self.rows, self.snake, self.food, self.score)
+
+    def _take_pending(self):
+        batch = bytes(self.pending)
+        self.pending.clear()
+        return batch
+
+    def _run(self):
+        while self.running:
+            for key, _ in self.selector.select(timeout=self.flush_interval):
+                if key.fileobj is self.listener:
+                    self._accept()
+                else:
+                    self._read(key.fileobj)
+
+            with self.lock:
+                batch = self._take_pending()
+            self._broadcast(batch)
+
+    def _accept(self):
+        try:
+            conn, _ = self.listener.accept()
+        except (BlockingIOError, OSError):
+            return
+        conn.setblocking(False)
+        if conn.family == socket.AF_INET:
+            conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        # Deltas queued so far belong to the existing clients; the newcomer
+        # starts from a keyframe of the state after them.
+        with self.lock:
+            batch = self._take_pending()
+            keyframe = self._keyframe()
+        self._broadcast(batch)
+
+        self.clients[conn] = bytearray(keyframe)
+        self.selector.register(conn, selectors.EVENT_READ)
+        self._send(conn)
+
+    def _read(self, conn):
+        # Spectators don't send anything; a read only tells us they left
+        try:
+            data = conn.recv(4096)
+        except BlockingIOError:
+            return
+        except OSError:
+            data = b""
+        if not data:
+            self._drop(conn)
+
+    def _broadcast(self, batch):
+        for conn in list(self.clients):
+            if batch:
+                self.clients[conn] += batch
+            self._send(conn)
+
+    def _send(self, conn):
+        buffer = self.clients.get(conn)
+        if not buffer:
+            return
+        try:
+            sent = conn.send(buffer)
+            del buffer[:sent]
+        except BlockingIOError:
+            pass
+        except OSError:
+            self._drop(conn)
+            return
+        if len(buffer) > self.max_buffer:
+            # Too slow to keep up; it can reconnect for a fresh keyframe
+            self._drop(conn)
+
+    def _drop(self, conn):
+        if conn in self.clients:
+            del self.clients[conn]
+            self.selector.unregister(conn)
+            conn.close()
+
+    def close(self):
+        self.running = False
+        self.thread.join()
+        for conn in list(self.clients):
+            self._drop(conn)
+        self.selector.close()
+        self.listener.close()
+        if self.unix_path and os.path.exists(self.unix_path):
+            os.unlink(self.unix_path)
+
+
+class StateStreamClient:
+    """Rebuilds the board from a StateStreamServer stream"""
+
+    def __init__(self, address):
+        family, sockaddr = parse_address(address)
+        self.sock = socket.socket(family, socket.SOCK_STREAM)
+        self.sock.connect(sockaddr)
+        self.buffer = bytearray()
+        self.cols = 0
+        self.rows = 0
+        self.snake = deque()
+        self.food = (0, 0)
+        self.score = 0
+        self.ticks = 0
+        self.bytes_received = 0
+        self.is_game_over = False
+        self.connected = True
+
+    def poll(self, timeout=0.1):
+        """Read whatever has arrived and apply it; False once disconnected"""
+        self.sock.settimeout(timeout)
+        try:
+            data = self.sock.recv(65536)
+        except socket.timeout:
+            return self.connected
+        if not data:
+            self.connected = False
+            return False
+        self.bytes_received += len(data)
+        self.buffer += data
+        self._apply()
+        return True
+
+    def _apply(self):
+        buffer = self.buffer
+        offset = 0
+        while offset < len(buffer):
+            msg_type = buffer[offset]
+            if msg_type == MSG_DELTA:
+                if len(buffer) - offset < DELTA.size:
+                    break
+                _, flags, x, y = DELTA.unpack_from(buffer, offset)
+                size = DELTA.size
+                if flags & FOOD_CHANGED:
+                    size += FOOD.size
+                if flags & SCORE_CHANGED:
+                    size += SCORE.size
+                if len(buffer) - offset < size:
+                    break
+                extra = offset + DELTA.size
+                self.snake.appendleft((x, y))
+                if flags & TAIL_REMOVED:
+                    self.snake.pop()
+                if flags & FOOD_CHANGED:
+                    self.food = FOOD.unpack_from(buffer, extra)
+                    extra += FOOD.size
+                if flags & SCORE_CHANGED:
+                    self.score = SCORE.unpack_from(buffer, extra)[0]
+                self.ticks += 1
+                offset += size
+            elif msg_type == MSG_KEYFRAME:
+                if len(buffer) - offset < KEYFRAME.size:
+                    break
+                _, cols, rows, fx, fy, score, length = KEYFRAME.unpack_from(buffer, offset)
+                size = KEYFRAME.size + length * SEGMENT.size
+                if len(buffer) - offset < size:
+                    break
+                start = offset + KEYFRAME.size
+                self.snake = deque(SEGMENT.iter_unpack(bytes(buffer[start:offset + size])))
+                self.cols, self.rows = cols, rows
+                self.food = (fx, fy)
+                self.score = score
+                self.is_game_over = False
+                offset += size
+            elif msg_type == MSG_GAME_OVER:
+                self.is_game_over = True
+                offset += GAME_OVER.size
+            else:
+                raise ValueError(f"Unknown message type: {msg_type}")
+        del buffer[:offset]
+
+    def render(self):
+        """Text picture of the current board"""
+        board = [["." for _ in range(self.cols)] for _ in range(self.rows)]
+        for i, (x, y) in enumerate(self.snake):
+            if 0 <= x < self.cols and 0 <= y < self.rows:
+                board[y][x] = "@" if i == 0 else "o"
+        fx, fy = self.food
+        if 0 <= fx < self.cols and 0 <= fy < self.rows:
+            board[fy][fx] = "*"
+        status = "GAME OVER" if self.is_game_over else f"Ticks: {self.ticks}"
+        bytes_per_tick = self.bytes_received / max(self.ticks, 1)
+        header = f"Score: {self.score}  {status}  ({bytes_per_tick:.1f} bytes/tick)"
+        return header + "\n" + "\n".join("".join(row) for row in board)
+
+    def close(self):
+        self.sock.close()
+
+
+def serve_headless(address, max_games=None, max_ticks=10000):
+    """Run the greedy AI headless as fast as possible and stream it"""
+    from batch_sim import BatchSnakeSim
+
+    sim = BatchSnakeSim(1)
+    server = StateStreamServer(address, sim.cols, sim.rows)
+    print(f"Streaming on {address}")
+    games = 0
+    try:
+        while max_games is None or games < max_games:
+            sim.reset()
+            server.reset([(x // sim.cell_size, y // sim.cell_size) for x, y in sim.snake(0)],
+                         sim.food[0], int(sim.score[0]))
+            # The greedy rule can circle forever, so cap each game's length
+            while not sim.done[0] and sim.steps[0] < max_ticks:
+                score = int(sim.score[0])
+                sim.step()
+                if sim.done[0] and int(sim.score[0]) == score:
+                    break
+                server.publish(tuple(int(v) for v in sim.head[0]), int(sim.score[0]) == score,
+                               sim.food[0], int(sim.score[0]))
+            server.game_over()
+            games += 1
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+
+def view(address):
+    """Reference spectator: redraw the board in the terminal"""
+    client = StateStreamClient(address)
+    last_draw = 0
+    try:
+        while client.poll():
+            if time.time() - last_draw >= 0.1:
+                print("\033[H\033[J" + client.render(), flush=True)
+                last_draw = time.time()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        client.close()
+
+if __name__ == "__main__":
+    mode = sys.argv[1] if len(sys.argv) > 1 else "view"
+    address = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_ADDRESS
+    if mode == "serve":
+        serve_headless(address)
+    else:
+        view(address)